@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 
 import os
+import codecs
+import signal
 import subprocess
 import threading
+import selectors
+import concurrent.futures
 import sys
 import json
 import shutil
 import random
 import string
+import hashlib
 
 import gi
 
@@ -16,6 +21,11 @@ try:
 except ImportError:
     VERSION = "dev"
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 gi.require_version("Gtk", "3.0")
 gi.require_version("GtkSource", "3.0")
 
@@ -44,7 +54,19 @@ CACHE_KEY_CODE = "code"
 CACHE_KEY_SETTINGS = "settings"
 
 CACHE_FILE_NAME = "python_runner_cache.json"
+INTERPRETER_CACHE_FILE_NAME = "interpreters.json"
 EXECUTION_TIMEOUT = 30
+CACHE_FLUSH_INTERVAL_S = 5
+OUTPUT_READ_CHUNK_SIZE = 65536
+CACHE_MAX_SIZE_BYTES = 4 * 1024 * 1024
+VERSION_PROBE_TIMEOUT_MS = 2000
+VERSION_FAILURE_TTL_S = 30
+VERSION_FAILURE_TEXTS = frozenset(("Not Found", "Error", "Timeout", "Version N/A"))
+VENV_PYTHON_NAMES = ("python3", "python", "python.exe")
+VERSION_PROBE_CODE = "import sys;sys.stdout.write('%d.%d.%d' % sys.version_info[:3])"
+
+ENV_SETTING_KEYS = frozenset((SETTING_USE_CUSTOM_VENV, SETTING_VENV_FOLDER))
+TAB_WIDTH_SETTING_KEYS = frozenset((SETTING_TAB_SIZE, SETTING_TRANSLATE_TABS))
 
 DEFAULT_TAB_SETTINGS = {
     SETTING_DRAW_WHITESPACES: DEFAULT_DRAW_WHITESPACES,
@@ -55,41 +77,218 @@ DEFAULT_TAB_SETTINGS = {
     SETTING_VENV_FOLDER: DEFAULT_VENV_FOLDER,
 }
 
+HOTKEY_TEXT = """--- Hotkeys ---
+Ctrl+R         : Run Code
+Ctrl+C         : Copy Code/Selection
+Ctrl+S         : Export Code to File...
+Ctrl+T / Ctrl+,: Open Tab Settings
+Ctrl+H         : Show Hotkeys (this list)
+Ctrl+N         : New Tab
+Ctrl+W         : Remove Current Tab
+Ctrl+P         : Pip Freeze (list packages)
+"""
+
+APP_CSS = b"""
+textview text selection:focus, textview text selection {
+    background-color: alpha(#333333, 0.5);
+}
+"""
+
+_css_provider = None
+_css_screens = set()
+
+
+def _dump_cache_json(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+
+
+def _load_cache_json(contents):
+    if orjson is not None:
+        return orjson.loads(contents)
+    return json.loads(contents)
+
+
+def _get_css_provider():
+    global _css_provider
+    if _css_provider is None:
+        css_provider = Gtk.CssProvider()
+        css_provider.load_from_data(APP_CSS)
+        _css_provider = css_provider
+    return _css_provider
+
+
+class TabWidgets:
+    __slots__ = (
+        "code_input",
+        "code_buffer",
+        "output_buffer",
+        "output_view",
+        "space_drawer",
+        "paned",
+    )
+
+    def __init__(
+        self, code_input, code_buffer, output_buffer, output_view, space_drawer, paned
+    ):
+        self.code_input = code_input
+        self.code_buffer = code_buffer
+        self.output_buffer = output_buffer
+        self.output_view = output_view
+        self.space_drawer = space_drawer
+        self.paned = paned
+
 
 class PythonRunnerApp(Gtk.Window):
     def __init__(self):
         Gtk.Window.__init__(self, title=f"Python Runner {VERSION}")
 
         self.set_default_size(INITIAL_WIDTH, INITIAL_HEIGHT)
-        self.set_size_request(INITIAL_WIDTH, INITIAL_HEIGHT)
         self.set_position(Gtk.WindowPosition.CENTER)
         self.connect("destroy", self.on_destroy)
         self._status_timeout_id = None
+        self._status_expiry = 0
         self._temporary_status_context = None
+        self._default_status_text = None
+        self._cache_dirty = False
+        self._apply_pending = False
+        self._pending_apply_keys = {}
+        self._code_runs = {}
+        self._spare_interpreter = None
+        self._interpreter_cache = {}
+        self._interp_path = None
+        self._status_refresh_id = None
+        self._current_paned = None
+        self._tab_paneds = []
+        self._version_probes = {}
+        self._python_version_failures = {}
+        self._code_text_cache = {}
+        self._system_python = None
+        self._reported_warnings = set()
 
         self.cache_dir_path = self._get_app_cache_dir()
         self.cache_file_path = os.path.join(self.cache_dir_path, CACHE_FILE_NAME)
+        self.interpreter_cache_file_path = os.path.join(
+            self.cache_dir_path, INTERPRETER_CACHE_FILE_NAME
+        )
+        self._python_version_cache = self._load_python_version_cache()
+        self._saved_python_versions = dict(self._python_version_cache)
+        self._cache_dir_ready = True
+        self._last_saved_hash = None
+        self._cache_ready = False
+        self._cache_flush_id = None
+        self._cache_writer = None
+        self._cache_oversize_warned = False
+        self._worker_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="pyrunner"
+        )
+        self._pip_freeze_processes = set()
+
+        self._style_manager = GtkSource.StyleSchemeManager.get_default()
+        lang_manager = GtkSource.LanguageManager.get_default()
+        self._python_lang = lang_manager.get_language(
+            "python3"
+        ) or lang_manager.get_language("python")
+        if not self._python_lang:
+            print("Warning: Python syntax highlighting not available.", file=sys.stderr)
+        self._reload_style_schemes()
+        self._style_manager.connect("notify::search-path", self._reload_style_schemes)
 
         self._setup_css()
+        self.freeze_child_notify()
         self._setup_ui()
         self._setup_hotkeys()
 
-        cache_loaded = self._load_code_from_cache()
-
-        if not cache_loaded:
-            self._add_new_tab()
-            self.on_show_hotkeys()
-
-        self.update_python_env_status()
+        self._load_code_from_cache()
+        self.thaw_child_notify()
 
         self.show_all()
 
     def on_destroy(self, _):
+        for run in list(self._code_runs.values()):
+            run["cancelled"] = True
+            self._kill_code_process(run)
+
+        if self._spare_interpreter:
+            self._discard_interpreter_process(self._spare_interpreter)
+            self._spare_interpreter = None
+
+        for process in list(self._pip_freeze_processes):
+            try:
+                process.kill()
+            except OSError:
+                pass
+        self._worker_pool.shutdown(wait=False, cancel_futures=True)
+
+        if self._cache_flush_id:
+            GLib.source_remove(self._cache_flush_id)
+            self._cache_flush_id = None
+
+        if self._status_refresh_id:
+            GLib.source_remove(self._status_refresh_id)
+            self._status_refresh_id = None
+
+        if self._status_timeout_id:
+            GLib.source_remove(self._status_timeout_id)
+            self._status_timeout_id = None
+
         saved_cache = self._save_code_to_cache()
         if not saved_cache:
             print("ERROR: Failed to save code cache on exit!", file=sys.stderr)
+        self._save_python_version_cache()
 
-        Gtk.main_quit()
+    def _load_python_version_cache(self):
+        try:
+            with open(self.interpreter_cache_file_path, "rb") as f:
+                entries = json.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(
+                f"Warning: Ignoring interpreter cache '{self.interpreter_cache_file_path}': {e}",
+                file=sys.stderr,
+            )
+            return {}
+
+        versions = {}
+        if not isinstance(entries, dict):
+            return versions
+        for py_interp, entry in entries.items():
+            try:
+                mtime_ns, py_ver = entry
+                if py_ver in VERSION_FAILURE_TEXTS:
+                    continue
+                if os.stat(py_interp).st_mtime_ns == mtime_ns:
+                    versions[py_interp] = py_ver
+            except (OSError, TypeError, ValueError):
+                continue
+        return versions
+
+    def _save_python_version_cache(self):
+        if self._python_version_cache == self._saved_python_versions:
+            return
+
+        entries = {}
+        for py_interp, py_ver in self._python_version_cache.items():
+            if py_ver in VERSION_FAILURE_TEXTS:
+                continue
+            try:
+                entries[py_interp] = [os.stat(py_interp).st_mtime_ns, py_ver]
+            except OSError:
+                continue
+
+        temp_file_path = self.interpreter_cache_file_path + ".tmp"
+        try:
+            with open(temp_file_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(temp_file_path, self.interpreter_cache_file_path)
+            self._saved_python_versions = dict(self._python_version_cache)
+        except OSError as e:
+            print(
+                f"Error saving interpreter cache to '{self.interpreter_cache_file_path}': {e}",
+                file=sys.stderr,
+            )
 
     def _get_app_cache_dir(self):
         cache_dir = GLib.get_user_cache_dir()
@@ -119,11 +318,11 @@ class PythonRunnerApp(Gtk.Window):
         return app_cache_dir
 
     def _generate_unique_tab_id(self):
-        existing_ids = set()
-        for i in range(self.notebook.get_n_pages()):
-            page_widget = self.notebook.get_nth_page(i)
-            if page_widget and hasattr(page_widget, "tab_id"):
-                existing_ids.add(page_widget.tab_id)
+        existing_ids = {
+            page_widget.tab_id
+            for page_widget in self._tab_paneds
+            if hasattr(page_widget, "tab_id")
+        }
 
         chars = string.ascii_letters + string.digits
         while True:
@@ -131,16 +330,47 @@ class PythonRunnerApp(Gtk.Window):
             if new_id not in existing_ids:
                 return new_id
 
-    def _save_code_to_cache(self):
-        tabs_data = []
-        n_pages = self.notebook.get_n_pages()
+    def _reload_style_schemes(self, *args):
+        self._scheme_cache = {}
+        self._sorted_schemes = None
+
+    def _lookup_style_scheme(self, scheme_id):
+        if scheme_id not in self._scheme_cache:
+            self._scheme_cache[scheme_id] = self._style_manager.get_scheme(scheme_id)
+        return self._scheme_cache[scheme_id]
+
+    def _get_sorted_schemes(self):
+        if self._sorted_schemes is None:
+            named_schemes = []
+            for sid in self._style_manager.get_scheme_ids() or ():
+                scheme = self._lookup_style_scheme(sid)
+                if scheme:
+                    name = scheme.get_name() or sid
+                    named_schemes.append((name.lower(), sid, name))
+            named_schemes.sort()
+            self._sorted_schemes = [(sid, name) for _, sid, name in named_schemes]
+        return self._sorted_schemes
+
+    def _get_style_scheme(self, scheme_id):
+        return (
+            self._lookup_style_scheme(scheme_id)
+            or self._lookup_style_scheme(DEFAULT_STYLE_SCHEME)
+            or self._lookup_style_scheme("classic")
+        )
+
+    def _save_code_to_cache(self, background=False):
+        if not self._cache_ready:
+            return True
 
-        for i in range(n_pages):
-            page_widget = self.notebook.get_nth_page(i)
+        self._wait_for_cache_writer()
+        if not self._cache_dirty and self._last_saved_hash is not None:
+            return True
 
+        tabs_data = []
+
+        for i, page_widget in enumerate(self._tab_paneds):
             if (
-                page_widget
-                and hasattr(page_widget, "tab_widgets")
+                hasattr(page_widget, "tab_widgets")
                 and hasattr(page_widget, "tab_settings")
                 and hasattr(page_widget, "tab_id")
             ):
@@ -153,10 +383,10 @@ class PythonRunnerApp(Gtk.Window):
                 ):
                     tab_settings[SETTING_USE_CUSTOM_VENV] = False
 
-                code_buffer = tab_widgets["code_buffer"]
-                start_iter = code_buffer.get_start_iter()
-                end_iter = code_buffer.get_end_iter()
-                code = code_buffer.get_text(start_iter, end_iter, False)
+                if tab_widgets:
+                    code = self._get_code(tab_widgets.code_buffer)
+                else:
+                    code = page_widget.tab_pending_code
 
                 tabs_data.append(
                     {
@@ -183,33 +413,148 @@ class PythonRunnerApp(Gtk.Window):
                     file=sys.stderr,
                 )
 
+        data = _dump_cache_json(tabs_data)
+        oversized = len(data) > CACHE_MAX_SIZE_BYTES
+        if oversized and not self._cache_oversize_warned:
+            message = (
+                f"Tabs exceed the {CACHE_MAX_SIZE_BYTES // (1024 * 1024)} MiB cache "
+                "limit; the next launch will set the cache aside."
+            )
+            print(f"Warning: {message}", file=sys.stderr)
+            self._set_status_message(message)
+        self._cache_oversize_warned = oversized
+
+        data_hash = hashlib.blake2b(data, digest_size=8).digest()
+        if data_hash == self._last_saved_hash:
+            self._cache_dirty = False
+            return True
+
+        self._last_saved_hash = data_hash
+        self._cache_dirty = False
+        if background:
+            self._cache_writer = threading.Thread(
+                target=self._write_cache_file, args=(data,), daemon=True
+            )
+            self._cache_writer.start()
+            return True
+        return self._write_cache_file(data)
+
+    def _wait_for_cache_writer(self):
+        if self._cache_writer:
+            self._cache_writer.join()
+            self._cache_writer = None
+
+    def _write_cache_file(self, data):
         try:
-            os.makedirs(self.cache_dir_path, exist_ok=True)
+            if not self._cache_dir_ready:
+                os.makedirs(self.cache_dir_path, exist_ok=True)
+                self._cache_dir_ready = True
             temp_file_path = self.cache_file_path + ".tmp"
-            with open(temp_file_path, "w", encoding="utf-8") as f:
-                json.dump(tabs_data, f, indent=4)
-            os.replace(temp_file_path, self.cache_file_path)
-
+            try:
+                with open(temp_file_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_file_path, self.cache_file_path)
+            except OSError:
+                try:
+                    os.unlink(temp_file_path)
+                except OSError:
+                    pass
+                raise
             return True
-        except Exception as e:
+        except OSError as e:
+            error = e
+        print(
+            f"Error saving code cache to '{self.cache_file_path}': {error}",
+            file=sys.stderr,
+        )
+        self._cache_dir_ready = False
+        self._last_saved_hash = None
+        self._cache_dirty = True
+        return False
+
+    def _mark_cache_dirty(self, *args):
+        self._cache_dirty = True
+
+    def _flush_cache_if_dirty(self):
+        if self._cache_dirty and not (
+            self._cache_writer and self._cache_writer.is_alive()
+        ):
+            self._save_code_to_cache(background=True)
+        self._save_python_version_cache()
+        return GLib.SOURCE_CONTINUE
+
+    def _load_code_from_cache(self):
+        try:
+            cache_size = os.stat(self.cache_file_path).st_size
+        except FileNotFoundError:
+            self._on_cache_load_finished(False)
+            return
+        except OSError as e:
             print(
-                f"Error saving code cache to '{self.cache_file_path}': {e}",
+                f"Error reading cache file '{self.cache_file_path}': {e}",
                 file=sys.stderr,
             )
-            if os.path.exists(temp_file_path):
-                try:
-                    os.remove(temp_file_path)
-                except OSError as rm_e:
-                    print(f"Error removing temp cache file: {rm_e}", file=sys.stderr)
-            return False
+            self._on_cache_load_finished(False)
+            return
 
-    def _load_code_from_cache(self):
-        if not os.path.exists(self.cache_file_path):
-            return False
+        if cache_size > CACHE_MAX_SIZE_BYTES:
+            oversized_path = self.cache_file_path + ".oversized"
+            suffix = 1
+            while os.path.exists(oversized_path):
+                oversized_path = f"{self.cache_file_path}.oversized.{suffix}"
+                suffix += 1
+            print(
+                f"Warning: Cache file '{self.cache_file_path}' is {cache_size} bytes "
+                f"(limit {CACHE_MAX_SIZE_BYTES}). Moving it to '{oversized_path}'.",
+                file=sys.stderr,
+            )
+            try:
+                os.replace(self.cache_file_path, oversized_path)
+            except OSError as e:
+                print(f"Error moving oversized cache file: {e}", file=sys.stderr)
+            self._on_cache_load_finished(False)
+            self._set_status_message(
+                "Cache file too large, started with a new tab.", temporary=False
+            )
+            return
+
+        Gio.File.new_for_path(self.cache_file_path).load_contents_async(
+            None, self._on_cache_contents_loaded
+        )
+
+    def _on_cache_contents_loaded(self, cache_file, result):
+        try:
+            _, contents, _ = cache_file.load_contents_finish(result)
+        except GLib.Error as e:
+            print(
+                f"Error reading cache file '{self.cache_file_path}': {e.message}",
+                file=sys.stderr,
+            )
+            self._on_cache_load_finished(False)
+            return
 
+        cache_loaded = self._restore_tabs_from_cache(contents)
+        if cache_loaded:
+            self._last_saved_hash = hashlib.blake2b(contents, digest_size=8).digest()
+        self._on_cache_load_finished(cache_loaded)
+
+    def _on_cache_load_finished(self, cache_loaded):
+        if not cache_loaded:
+            self._add_new_tab()
+
+        self.update_python_env_status()
+        if not self._status_expiry:
+            self._set_status_message("Press Ctrl+H for hotkeys.")
+
+        self._cache_ready = True
+        self._cache_dirty = False
+        self._cache_flush_id = GLib.timeout_add_seconds(
+            CACHE_FLUSH_INTERVAL_S, self._flush_cache_if_dirty
+        )
+
+    def _restore_tabs_from_cache(self, contents):
         try:
-            with open(self.cache_file_path, "r", encoding="utf-8") as f:
-                tabs_data = json.load(f)
+            tabs_data = _load_cache_json(contents)
 
             if not isinstance(tabs_data, list):
                 print(
@@ -289,14 +634,17 @@ class PythonRunnerApp(Gtk.Window):
                     )
 
                 self._add_tab_with_content(
-                    code, final_settings, existing_id=final_tab_id, save_cache=False
+                    code,
+                    final_settings,
+                    existing_id=final_tab_id,
+                    save_cache=False,
+                    switch_to=False,
                 )
                 num_loaded += 1
 
             if self.notebook.get_n_pages() > 0:
                 self.notebook.set_current_page(0)
 
-            self.on_show_hotkeys()
             return True
 
         except json.JSONDecodeError as e:
@@ -318,19 +666,16 @@ class PythonRunnerApp(Gtk.Window):
             return False
 
     def _setup_css(self):
-        css_provider = Gtk.CssProvider()
-        css = f"""
-        textview text selection:focus, textview text selection {{
-            background-color: alpha(#333333, 0.5);
-        }}
-        """
+        screen = Gdk.Screen.get_default()
+        if screen in _css_screens:
+            return
         try:
-            css_provider.load_from_data(css.encode())
             Gtk.StyleContext.add_provider_for_screen(
-                Gdk.Screen.get_default(),
-                css_provider,
+                screen,
+                _get_css_provider(),
                 Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
             )
+            _css_screens.add(screen)
         except Exception as e:
             print(f"Error loading CSS: {e}", file=sys.stderr)
 
@@ -340,9 +685,12 @@ class PythonRunnerApp(Gtk.Window):
         self.notebook = Gtk.Notebook(scrollable=True)
         vbox.pack_start(self.notebook, True, True, 0)
         self.notebook.connect("switch-page", self.on_tab_switched)
+        self.notebook.connect("page-added", self.on_page_added)
         self.notebook.connect("page-removed", self.on_page_removed)
+        self.notebook.connect("page-reordered", self.on_page_reordered)
         status_box = self._setup_statusbar()
         vbox.pack_start(status_box, False, False, 0)
+        self._clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
 
     def _add_new_tab(self):
         initial_tab_settings = DEFAULT_TAB_SETTINGS.copy()
@@ -351,9 +699,12 @@ class PythonRunnerApp(Gtk.Window):
         )
 
     def _add_tab_with_content(
-        self, code, tab_settings, existing_id=None, save_cache=True
+        self, code, tab_settings, existing_id=None, save_cache=True, switch_to=True
     ):
-        tab_content_paned = self._create_tab_content(tab_settings)
+        tab_content_paned = Gtk.Paned(orientation=Gtk.Orientation.VERTICAL)
+        tab_content_paned.tab_settings = {**DEFAULT_TAB_SETTINGS, **tab_settings}
+        tab_content_paned.tab_widgets = None
+        tab_content_paned.tab_pending_code = code or ""
 
         if (
             existing_id
@@ -365,76 +716,59 @@ class PythonRunnerApp(Gtk.Window):
             tab_id = self._generate_unique_tab_id()
         tab_content_paned.tab_id = tab_id
 
-        code_buffer = tab_content_paned.tab_widgets["code_buffer"]
-        code_buffer.set_text(code or "", -1)
-
         tab_label_widget = Gtk.Label(label=tab_id)
+        tab_label_widget.show()
+        tab_content_paned.show()
 
-        self.notebook.append_page(tab_content_paned, tab_label_widget)
-        self.notebook.show_all()
-        new_page_index = self.notebook.get_n_pages() - 1
-        self.notebook.set_current_page(new_page_index)
-
-        self.update_python_env_status()
+        new_page_index = self.notebook.append_page(tab_content_paned, tab_label_widget)
+        if switch_to:
+            self.notebook.set_current_page(new_page_index)
 
         if save_cache:
-            self._save_code_to_cache()
+            self._mark_cache_dirty()
 
-    def _create_tab_content(self, initial_tab_settings):
-        paned = Gtk.Paned(orientation=Gtk.Orientation.VERTICAL)
-        paned.tab_settings = initial_tab_settings.copy()
-        paned.tab_widgets = {}
+    def _ensure_tab_content(self, paned):
+        if getattr(paned, "tab_widgets", True) is None:
+            self._create_tab_content(paned)
 
-        code_buffer = GtkSource.Buffer()
-        code_input = GtkSource.View.new_with_buffer(code_buffer)
+    def _create_tab_content(self, paned):
+        settings = paned.tab_settings
 
-        lang_manager = GtkSource.LanguageManager.get_default()
-        python_lang = lang_manager.get_language("python3") or lang_manager.get_language(
-            "python"
+        code_buffer = GtkSource.Buffer()
+        code_buffer.begin_not_undoable_action()
+        code_buffer.set_text(paned.tab_pending_code, -1)
+        code_buffer.end_not_undoable_action()
+        paned.tab_pending_code = None
+        code_buffer.connect("changed", self._on_code_buffer_changed)
+        margin = 10
+        code_input = GtkSource.View(
+            buffer=code_buffer,
+            wrap_mode=Gtk.WrapMode.WORD_CHAR,
+            monospace=True,
+            show_line_numbers=True,
+            highlight_current_line=True,
+            auto_indent=True,
+            indent_on_tab=True,
+            tab_width=settings[SETTING_TAB_SIZE],
+            insert_spaces_instead_of_tabs=settings[SETTING_TRANSLATE_TABS],
+            left_margin=margin,
+            right_margin=margin,
+            top_margin=margin,
+            bottom_margin=margin,
         )
-        if python_lang:
-            code_buffer.set_language(python_lang)
-        else:
-            print("Warning: Python syntax highlighting not available.", file=sys.stderr)
 
-        style_manager = GtkSource.StyleSchemeManager.get_default()
-        scheme_id = initial_tab_settings.get(
-            SETTING_COLOR_SCHEME_ID, DEFAULT_STYLE_SCHEME
-        )
-        scheme = (
-            style_manager.get_scheme(scheme_id)
-            or style_manager.get_scheme(DEFAULT_STYLE_SCHEME)
-            or style_manager.get_scheme("classic")
-        )
+        if self._python_lang:
+            code_buffer.set_language(self._python_lang)
+
+        scheme = self._get_style_scheme(settings[SETTING_COLOR_SCHEME_ID])
         if scheme:
             code_buffer.set_style_scheme(scheme)
         else:
             print(f"Error: Could not find any valid color scheme.", file=sys.stderr)
 
-        code_input.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
-        code_input.set_monospace(True)
-        code_input.set_show_line_numbers(True)
-        code_input.set_highlight_current_line(True)
-        code_input.set_auto_indent(True)
-        code_input.set_indent_on_tab(True)
-        code_input.set_tab_width(
-            initial_tab_settings.get(SETTING_TAB_SIZE, DEFAULT_TAB_SIZE)
-        )
-        code_input.set_insert_spaces_instead_of_tabs(
-            initial_tab_settings.get(SETTING_TRANSLATE_TABS, DEFAULT_TRANSLATE_TABS)
-        )
-
-        margin = 10
-        code_input.set_left_margin(margin)
-        code_input.set_right_margin(margin)
-        code_input.set_top_margin(margin)
-        code_input.set_bottom_margin(margin)
-
         space_drawer = code_input.get_space_drawer()
         space_drawer.set_enable_matrix(True)
-        draw_ws = initial_tab_settings.get(
-            SETTING_DRAW_WHITESPACES, DEFAULT_DRAW_WHITESPACES
-        )
+        draw_ws = settings[SETTING_DRAW_WHITESPACES]
         types = (
             GtkSource.SpaceTypeFlags.SPACE | GtkSource.SpaceTypeFlags.TAB
             if draw_ws
@@ -443,9 +777,12 @@ class PythonRunnerApp(Gtk.Window):
         space_drawer.set_types_for_locations(GtkSource.SpaceLocationFlags.ALL, types)
 
         scrolled_code = Gtk.ScrolledWindow(
-            hexpand=True, vexpand=True, shadow_type=Gtk.ShadowType.IN
+            hexpand=True,
+            vexpand=True,
+            shadow_type=Gtk.ShadowType.IN,
+            hscrollbar_policy=Gtk.PolicyType.AUTOMATIC,
+            vscrollbar_policy=Gtk.PolicyType.AUTOMATIC,
         )
-        scrolled_code.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         scrolled_code.add(code_input)
         paned.add1(scrolled_code)
 
@@ -455,29 +792,27 @@ class PythonRunnerApp(Gtk.Window):
             editable=False,
             monospace=True,
             wrap_mode=Gtk.WrapMode.WORD_CHAR,
+            left_margin=margin,
+            right_margin=margin,
+            top_margin=margin,
+            bottom_margin=margin,
         )
-        output_view.set_left_margin(margin)
-        output_view.set_right_margin(margin)
-        output_view.set_top_margin(margin)
-        output_view.set_bottom_margin(margin)
 
         scrolled_output = Gtk.ScrolledWindow(
-            hexpand=True, vexpand=True, shadow_type=Gtk.ShadowType.IN
+            hexpand=True,
+            vexpand=True,
+            shadow_type=Gtk.ShadowType.IN,
+            hscrollbar_policy=Gtk.PolicyType.AUTOMATIC,
+            vscrollbar_policy=Gtk.PolicyType.AUTOMATIC,
         )
-        scrolled_output.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         scrolled_output.add(output_view)
         paned.add2(scrolled_output)
 
         paned.set_position(INITIAL_HEIGHT // 2 - 30)
-        paned.tab_widgets = {
-            "code_input": code_input,
-            "code_buffer": code_buffer,
-            "output_buffer": output_buffer,
-            "output_view": output_view,
-            "space_drawer": space_drawer,
-            "paned": paned,
-        }
-        return paned
+        paned.tab_widgets = TabWidgets(
+            code_input, code_buffer, output_buffer, output_view, space_drawer, paned
+        )
+        paned.show_all()
 
     def _setup_statusbar(self):
         status_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
@@ -495,43 +830,26 @@ class PythonRunnerApp(Gtk.Window):
     def _setup_hotkeys(self):
         accel_group = Gtk.AccelGroup()
         self.add_accel_group(accel_group)
-        keymap = {
-            "<Control>R": self.on_run_clicked,
-            "<Control>C": self.on_copy_clicked,
-            "<Control>S": self.on_export_clicked,
-            "<Control>T": self.on_settings_clicked,
-            "<Control>comma": self.on_settings_clicked,
-            "<Control>H": self.on_show_hotkeys,
-            "<Control>N": self.on_new_tab_clicked,
-            "<Control>W": self.on_remove_tab_clicked,
-            "<Control>P": self.on_pip_freeze_clicked,
-        }
-        for accel, callback in keymap.items():
-            key, mod = Gtk.accelerator_parse(accel)
-            if key != 0:
-                accel_group.connect(key, mod, Gtk.AccelFlags.VISIBLE, callback)
-            else:
-                print(
-                    f"Warning: Failed to parse accelerator '{accel}'", file=sys.stderr
-                )
+        for key, callback in (
+            (Gdk.KEY_r, self.on_run_clicked),
+            (Gdk.KEY_c, self.on_copy_clicked),
+            (Gdk.KEY_s, self.on_export_clicked),
+            (Gdk.KEY_t, self.on_settings_clicked),
+            (Gdk.KEY_comma, self.on_settings_clicked),
+            (Gdk.KEY_h, self.on_show_hotkeys),
+            (Gdk.KEY_n, self.on_new_tab_clicked),
+            (Gdk.KEY_w, self.on_remove_tab_clicked),
+            (Gdk.KEY_p, self.on_pip_freeze_clicked),
+        ):
+            accel_group.connect(
+                key, Gdk.ModifierType.CONTROL_MASK, Gtk.AccelFlags.VISIBLE, callback
+            )
 
     def _get_current_tab_widgets_settings_id(self):
-        idx = self.notebook.get_current_page()
-        if idx == -1:
-            return None, None, None
-        paned = self.notebook.get_nth_page(idx)
-        if (
-            paned
-            and hasattr(paned, "tab_widgets")
-            and isinstance(paned.tab_widgets, dict)
-            and hasattr(paned, "tab_settings")
-            and isinstance(paned.tab_settings, dict)
-            and hasattr(paned, "tab_id")
-            and isinstance(paned.tab_id, str)
-        ):
-            return paned.tab_widgets, paned.tab_settings, paned.tab_id
-        else:
+        paned = self._current_paned
+        if paned is None or not hasattr(paned, "tab_widgets"):
             return None, None, None
+        return paned.tab_widgets, paned.tab_settings, paned.tab_id
 
     def _get_current_tab_widgets(self):
         widgets, _, _ = self._get_current_tab_widgets_settings_id()
@@ -541,67 +859,294 @@ class PythonRunnerApp(Gtk.Window):
         _, _, tab_id = self._get_current_tab_widgets_settings_id()
         return tab_id
 
-    def _run_code_thread(
+    def _on_code_buffer_changed(self, code_buffer):
+        self._code_text_cache.pop(code_buffer, None)
+        self._mark_cache_dirty()
+
+    def _get_code(self, code_buffer):
+        code = self._code_text_cache.get(code_buffer)
+        if code is None:
+            code = code_buffer.get_text(
+                code_buffer.get_start_iter(), code_buffer.get_end_iter(), False
+            )
+            self._code_text_cache[code_buffer] = code
+        return code
+
+    def _start_code_process(
         self, code, python_interpreter, output_buffer, output_view, source_view
     ):
-        output, error, success = "", "", False
-        process = None
+        previous_run = self._code_runs.pop(source_view, None)
+        if previous_run:
+            previous_run["cancelled"] = True
+            self._kill_code_process(previous_run)
+
         try:
-            process = subprocess.Popen(
-                [python_interpreter, "-u", "-c", code],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
+            pid, stdin_fd, stdout_fd, stderr_fd = self._take_interpreter_process(
+                python_interpreter
             )
-            stdout_data, stderr_data = process.communicate(timeout=EXECUTION_TIMEOUT)
-            if process.returncode == 0:
-                output = stdout_data
-                success = True
-                if stderr_data:
-                    error = f"--- Warnings/Stderr Output ---\n{stderr_data}"
-            else:
-                output = stdout_data
-                error = f"--- Error (Exit Code {process.returncode}) ---\n{stderr_data}"
-        except FileNotFoundError:
-            error = f"Error: Interpreter '{python_interpreter}' not found."
-        except subprocess.TimeoutExpired:
-            success = False
-            if process:
-                process.kill()
-                try:
-                    stdout_data, stderr_data = process.communicate(timeout=1)
-                except Exception:
-                    stdout_data, stderr_data = (
-                        "",
-                        "(Timeout/Error fetching output after kill)",
-                    )
-                output = stdout_data
-                error = f"--- Error: Code timed out ({EXECUTION_TIMEOUT}s) ---\n{stderr_data}"
-            else:
-                error = f"Error: Code timed out ({EXECUTION_TIMEOUT}s)."
-        except Exception as e:
-            error = f"Error executing code: {e}"
-            success = False
-        finally:
-            if process and process.poll() is None:
-                try:
-                    process.kill()
-                    process.communicate(timeout=1)
-                except Exception:
-                    pass
+        except OSError as e:
+            self._update_output_view(
+                "",
+                f"Error executing code: {e}",
+                False,
+                output_buffer,
+                output_view,
+                source_view,
+            )
+            return
 
+        run = {
+            "pid": pid,
+            "wait_status": 0,
+            "output_buffer": output_buffer,
+            "output_view": output_view,
+            "source_view": source_view,
+            "decoders": {
+                "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+                "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            },
+            "stdout": [],
+            "stdout_flush_id": None,
+            "stderr": [],
+            "pending": 3,
+            "timed_out": False,
+            "cancelled": False,
+            "timeout_id": None,
+        }
+        run["timeout_id"] = GLib.timeout_add_seconds(
+            EXECUTION_TIMEOUT, self._on_code_run_timeout, run
+        )
+        self._code_runs[source_view] = run
+
+        Gio.UnixOutputStream.new(stdin_fd, True).splice_async(
+            Gio.MemoryInputStream.new_from_bytes(GLib.Bytes.new(code.encode("utf-8"))),
+            Gio.OutputStreamSpliceFlags.CLOSE_SOURCE
+            | Gio.OutputStreamSpliceFlags.CLOSE_TARGET,
+            GLib.PRIORITY_DEFAULT,
+            None,
+            self._on_code_stdin_written,
+            run,
+        )
+        self._read_code_stream(Gio.UnixInputStream.new(stdout_fd, True), run, "stdout")
+        self._read_code_stream(Gio.UnixInputStream.new(stderr_fd, True), run, "stderr")
+        GLib.child_watch_add(
+            GLib.PRIORITY_DEFAULT, pid, self._on_code_process_exited, run
+        )
         GLib.idle_add(
-            self._update_output_view,
-            output,
-            error,
-            success,
-            output_buffer,
-            output_view,
-            source_view,
+            self._prespawn_interpreter_process,
+            python_interpreter,
+            priority=GLib.PRIORITY_LOW,
         )
 
+    def _spawn_interpreter_process(self, python_interpreter):
+        child_fds, parent_fds = [], []
+        try:
+            read_fd, write_fd = os.pipe()
+            child_fds.append(read_fd)
+            parent_fds.append(write_fd)
+            for _ in range(2):
+                read_fd, write_fd = os.pipe()
+                child_fds.append(write_fd)
+                parent_fds.append(read_fd)
+            pid = os.posix_spawn(
+                python_interpreter,
+                [python_interpreter, "-u", "-"],
+                os.environ,
+                file_actions=[
+                    (os.POSIX_SPAWN_DUP2, fd, target)
+                    for target, fd in enumerate(child_fds)
+                ],
+                setsid=True,
+            )
+        except OSError:
+            for fd in parent_fds:
+                os.close(fd)
+            raise
+        finally:
+            for fd in child_fds:
+                os.close(fd)
+        return {
+            "interpreter": python_interpreter,
+            "cwd": os.getcwd(),
+            "pid": pid,
+            "fds": tuple(parent_fds),
+        }
+
+    def _take_interpreter_process(self, python_interpreter):
+        spare, self._spare_interpreter = self._spare_interpreter, None
+        if spare and not self._interpreter_process_alive(spare):
+            for fd in spare["fds"]:
+                os.close(fd)
+            spare = None
+        if spare and (spare["interpreter"], spare["cwd"]) != (
+            python_interpreter,
+            os.getcwd(),
+        ):
+            self._discard_interpreter_process(spare)
+            spare = None
+        if not spare:
+            spare = self._spawn_interpreter_process(python_interpreter)
+        return (spare["pid"],) + spare["fds"]
+
+    def _interpreter_process_alive(self, spare):
+        # No child watch is attached to a spare yet, so reaping it here is safe.
+        try:
+            pid, _ = os.waitpid(spare["pid"], os.WNOHANG)
+        except ChildProcessError:
+            return False
+        return pid == 0
+
+    def _prespawn_interpreter_process(self, python_interpreter):
+        if self._spare_interpreter is None:
+            try:
+                self._spare_interpreter = self._spawn_interpreter_process(
+                    python_interpreter
+                )
+            except OSError as e:
+                print(f"Error pre-starting interpreter: {e}", file=sys.stderr)
+        return GLib.SOURCE_REMOVE
+
+    def _discard_interpreter_process(self, spare):
+        try:
+            os.killpg(spare["pid"], signal.SIGKILL)
+        except OSError:
+            pass
+        for fd in spare["fds"]:
+            os.close(fd)
+        GLib.child_watch_add(
+            GLib.PRIORITY_DEFAULT,
+            spare["pid"],
+            lambda pid, wait_status: GLib.spawn_close_pid(pid),
+        )
+
+    def _on_code_stdin_written(self, stream, result, run):
+        try:
+            stream.splice_finish(result)
+        except GLib.Error as e:
+            if not run["cancelled"] and not run["timed_out"]:
+                print(
+                    f"Error writing code to interpreter: {e.message}", file=sys.stderr
+                )
+
+    def _read_code_stream(self, stream, run, stream_name):
+        stream.read_bytes_async(
+            OUTPUT_READ_CHUNK_SIZE,
+            GLib.PRIORITY_DEFAULT,
+            None,
+            self._on_code_stream_read,
+            (run, stream_name),
+        )
+
+    def _on_code_stream_read(self, stream, result, user_data):
+        run, stream_name = user_data
+        try:
+            data = stream.read_bytes_finish(result).get_data()
+        except GLib.Error as e:
+            print(
+                f"Error reading {stream_name} of code run: {e.message}", file=sys.stderr
+            )
+            data = b""
+
+        text = run["decoders"][stream_name].decode(data, final=not data)
+        if text and not run["cancelled"]:
+            run[stream_name].append(text)
+            if stream_name == "stdout" and not run["stdout_flush_id"]:
+                run["stdout_flush_id"] = GLib.idle_add(self._flush_code_output, run)
+
+        if data:
+            self._read_code_stream(stream, run, stream_name)
+        else:
+            self._complete_code_run_step(run)
+
+    def _flush_code_output(self, run):
+        run["stdout_flush_id"] = None
+        text = "".join(run["stdout"])
+        run["stdout"].clear()
+        if text and not run["cancelled"]:
+            self._append_output(run["output_buffer"], run["output_view"], text)
+        return GLib.SOURCE_REMOVE
+
+    def _on_code_process_exited(self, pid, wait_status, run):
+        GLib.spawn_close_pid(pid)
+        run["wait_status"] = wait_status
+        self._complete_code_run_step(run)
+
+    def _on_code_run_timeout(self, run):
+        run["timeout_id"] = None
+        run["timed_out"] = True
+        self._kill_code_process(run)
+        return GLib.SOURCE_REMOVE
+
+    def _kill_code_process(self, run):
+        try:
+            os.killpg(run["pid"], signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except OSError as e:
+            print(f"Error killing code run: {e}", file=sys.stderr)
+
+    def _complete_code_run_step(self, run):
+        run["pending"] -= 1
+        if run["pending"] > 0:
+            return
+
+        if run["timeout_id"]:
+            GLib.source_remove(run["timeout_id"])
+            run["timeout_id"] = None
+        if self._code_runs.get(run["source_view"]) is run:
+            del self._code_runs[run["source_view"]]
+        if run["stdout_flush_id"]:
+            GLib.source_remove(run["stdout_flush_id"])
+            self._flush_code_output(run)
+        if run["cancelled"]:
+            return
+
+        stderr_data = "".join(run["stderr"])
+        if run["timed_out"]:
+            error = (
+                f"--- Error: Code timed out ({EXECUTION_TIMEOUT}s) ---\n{stderr_data}"
+            )
+        else:
+            returncode = os.waitstatus_to_exitcode(run["wait_status"])
+            if returncode == 0:
+                error = (
+                    f"--- Warnings/Stderr Output ---\n{stderr_data}"
+                    if stderr_data
+                    else ""
+                )
+            else:
+                error = f"--- Error (Exit Code {returncode}) ---\n{stderr_data}"
+
+        output_buffer, output_view = run["output_buffer"], run["output_view"]
+        if error:
+            if output_buffer.get_char_count() > 0:
+                error = "\n" + error
+            self._append_output(output_buffer, output_view, error)
+        self._restore_status_after_output(run["source_view"])
+
+    def _append_output(self, output_buffer, output_view, text):
+        adjustment = output_view.get_vadjustment()
+        at_bottom = (
+            adjustment.get_value() + adjustment.get_page_size()
+            >= adjustment.get_upper()
+        )
+
+        output_buffer.begin_user_action()
+        output_buffer.insert(output_buffer.get_end_iter(), text)
+        output_buffer.end_user_action()
+
+        if at_bottom:
+            output_buffer.place_cursor(output_buffer.get_end_iter())
+            output_view.scroll_to_mark(output_buffer.get_insert(), 0.0, False, 0.0, 1.0)
+
+    def _clear_output(self, output_buffer):
+        if output_buffer.get_char_count() > 0:
+            output_buffer.begin_user_action()
+            output_buffer.delete(
+                output_buffer.get_start_iter(), output_buffer.get_end_iter()
+            )
+            output_buffer.end_user_action()
+
     def _update_output_view(
         self, output_text, error_text, success, output_buffer, output_view, source_view
     ):
@@ -615,28 +1160,29 @@ class PythonRunnerApp(Gtk.Window):
         output_buffer.place_cursor(end_iter)
         output_view.scroll_to_mark(output_buffer.get_insert(), 0.0, False, 0.0, 1.0)
 
+        self._restore_status_after_output(source_view)
+        return GLib.SOURCE_REMOVE
+
+    def _restore_status_after_output(self, source_view):
         current_widgets = self._get_current_tab_widgets()
-        active_source_view = current_widgets["code_input"] if current_widgets else None
+        active_source_view = current_widgets.code_input if current_widgets else None
         if (
             source_view == active_source_view
             and source_view == self._temporary_status_context
         ):
             self._restore_default_status()
 
-        return GLib.SOURCE_REMOVE
-
     def on_run_clicked(self, *args):
         tab_widgets, _, tab_id = self._get_current_tab_widgets_settings_id()
         if not tab_widgets:
             self._set_status_message("No active tab found.")
             return
 
-        code_buffer = tab_widgets["code_buffer"]
-        output_buffer = tab_widgets["output_buffer"]
-        output_view = tab_widgets["output_view"]
-        code_input = tab_widgets["code_input"]
-        start_iter, end_iter = code_buffer.get_start_iter(), code_buffer.get_end_iter()
-        code = code_buffer.get_text(start_iter, end_iter, False)
+        code_buffer = tab_widgets.code_buffer
+        output_buffer = tab_widgets.output_buffer
+        output_view = tab_widgets.output_view
+        code_input = tab_widgets.code_input
+        code = self._get_code(code_buffer)
 
         if not code.strip():
             self._set_status_message(
@@ -644,7 +1190,7 @@ class PythonRunnerApp(Gtk.Window):
             )
             return
 
-        python_interpreter = self.get_python_interpreter()
+        python_interpreter = self._interp_path or self.get_python_interpreter()
         if python_interpreter.startswith("Warning:") or not os.path.exists(
             python_interpreter
         ):
@@ -659,31 +1205,27 @@ class PythonRunnerApp(Gtk.Window):
                 "Failed to save cache before running!", temporary=False
             )
 
-        output_buffer.set_text("")
+        self._clear_output(output_buffer)
         self._set_status_message(
             f"Running with {os.path.basename(python_interpreter)}...",
             temporary_source_view=code_input,
         )
-        thread = threading.Thread(
-            target=self._run_code_thread,
-            args=(code, python_interpreter, output_buffer, output_view, code_input),
-            daemon=True,
+        self._start_code_process(
+            code, python_interpreter, output_buffer, output_view, code_input
         )
-        thread.start()
 
     def on_copy_clicked(self, *args):
         tab_widgets, _, tab_id = self._get_current_tab_widgets_settings_id()
         if not tab_widgets:
             return
-        code_buffer, code_input = tab_widgets["code_buffer"], tab_widgets["code_input"]
+        code_buffer, code_input = tab_widgets.code_buffer, tab_widgets.code_input
         if code_buffer.get_has_selection():
             start, end = code_buffer.get_selection_bounds()
             text = code_buffer.get_text(start, end, True)
         else:
-            start, end = code_buffer.get_start_iter(), code_buffer.get_end_iter()
-            text = code_buffer.get_text(start, end, False)
+            text = self._get_code(code_buffer)
         if text:
-            Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD).set_text(text, -1)
+            self._clipboard.set_text(text, -1)
             self._set_status_message(f"Code copied", temporary_source_view=code_input)
         else:
             self._set_status_message(
@@ -695,9 +1237,8 @@ class PythonRunnerApp(Gtk.Window):
         if not tab_widgets or not tab_id:
             self._set_status_message("No active tab to export.")
             return
-        code_buffer, code_input = tab_widgets["code_buffer"], tab_widgets["code_input"]
-        start, end = code_buffer.get_start_iter(), code_buffer.get_end_iter()
-        code = code_buffer.get_text(start, end, False)
+        code_buffer, code_input = tab_widgets.code_buffer, tab_widgets.code_input
+        code = self._get_code(code_buffer)
         if not code.strip():
             self._set_status_message(
                 f"No code to export", temporary_source_view=code_input
@@ -801,7 +1342,7 @@ class PythonRunnerApp(Gtk.Window):
             self._set_status_message("Error accessing tab settings/ID.")
             return
 
-        current_tab_settings = current_paned.tab_settings.copy()
+        snap = dict(current_paned.tab_settings)
 
         dialog = Gtk.Dialog(
             title=f"Settings for Tab {current_tab_id}",
@@ -827,24 +1368,13 @@ class PythonRunnerApp(Gtk.Window):
         editor_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6, margin=6)
         editor_frame.add(editor_vbox)
 
-        style_manager = GtkSource.StyleSchemeManager.get_default()
-        scheme_ids = style_manager.get_scheme_ids() or []
-        schemes_data = []
-        if scheme_ids:
-            for sid in sorted(scheme_ids):
-                scheme = style_manager.get_scheme(sid)
-                schemes_data.append({"id": sid, "name": scheme.get_name() or sid})
-            schemes_data.sort(key=lambda x: x["name"].lower())
+        schemes_data = self._get_sorted_schemes()
 
         dw_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
         editor_vbox.pack_start(dw_hbox, False, False, 0)
         dw_label = Gtk.Label(label="Draw Whitespaces:", xalign=0.0)
         dw_hbox.pack_start(dw_label, True, True, 0)
-        dw_switch = Gtk.Switch(
-            active=current_tab_settings.get(
-                SETTING_DRAW_WHITESPACES, DEFAULT_DRAW_WHITESPACES
-            )
-        )
+        dw_switch = Gtk.Switch(active=snap[SETTING_DRAW_WHITESPACES])
         dw_hbox.pack_end(dw_switch, False, False, 0)
 
         cs_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
@@ -854,54 +1384,40 @@ class PythonRunnerApp(Gtk.Window):
         cs_combo = Gtk.ComboBoxText()
         cs_hbox.pack_start(cs_combo, True, True, 0)
         cs_combo.set_size_request(150, -1)
-        active_idx = -1
-        current_cs_id = current_tab_settings.get(
-            SETTING_COLOR_SCHEME_ID, DEFAULT_STYLE_SCHEME
-        )
-        for i, si in enumerate(schemes_data):
-            cs_combo.append(si["id"], si["name"])
-        active_idx = next(
-            (i for i, si in enumerate(schemes_data) if si["id"] == current_cs_id), -1
-        )
-        if active_idx != -1:
-            cs_combo.set_active(active_idx)
-        elif schemes_data:
+        current_cs_id = snap[SETTING_COLOR_SCHEME_ID]
+        for scheme_id, scheme_name in schemes_data:
+            cs_combo.append(scheme_id, scheme_name)
+        if not schemes_data:
+            cs_label.set_sensitive(False)
+            cs_combo.set_sensitive(False)
+        elif not cs_combo.set_active_id(current_cs_id):
             cs_combo.set_active(0)
             print(
                 f"Warn: Scheme '{current_cs_id}' not found for tab {current_tab_id}. Selecting first.",
                 file=sys.stderr,
             )
-        elif not schemes_data:
-            cs_label.set_sensitive(False)
-            cs_combo.set_sensitive(False)
 
         ts_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
         editor_vbox.pack_start(ts_hbox, False, False, 0)
         ts_label = Gtk.Label(label="Tab Size (Spaces):", xalign=0.0)
         ts_hbox.pack_start(ts_label, True, True, 0)
         ts_spin = Gtk.SpinButton.new_with_range(1, 16, 1)
-        ts_spin.set_value(current_tab_settings.get(SETTING_TAB_SIZE, DEFAULT_TAB_SIZE))
+        ts_spin.set_value(snap[SETTING_TAB_SIZE])
         ts_hbox.pack_end(ts_spin, False, False, 0)
 
         tt_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
         editor_vbox.pack_start(tt_hbox, False, False, 0)
         tt_label = Gtk.Label(label="Use Spaces Instead of Tabs:", xalign=0.0)
         tt_hbox.pack_start(tt_label, True, True, 0)
-        tt_switch = Gtk.Switch(
-            active=current_tab_settings.get(
-                SETTING_TRANSLATE_TABS, DEFAULT_TRANSLATE_TABS
-            )
-        )
+        tt_switch = Gtk.Switch(active=snap[SETTING_TRANSLATE_TABS])
         tt_hbox.pack_end(tt_switch, False, False, 0)
 
         venv_frame = Gtk.Frame(label="Python Environment")
         main_vbox.pack_start(venv_frame, False, False, 0)
         venv_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6, margin=6)
         venv_frame.add(venv_vbox)
-        use_custom = current_tab_settings.get(
-            SETTING_USE_CUSTOM_VENV, DEFAULT_USE_CUSTOM_VENV
-        )
-        venv_folder = current_tab_settings.get(SETTING_VENV_FOLDER, DEFAULT_VENV_FOLDER)
+        use_custom = snap[SETTING_USE_CUSTOM_VENV]
+        venv_folder = snap[SETTING_VENV_FOLDER]
 
         cv_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
         venv_vbox.pack_start(cv_hbox, False, False, 0)
@@ -986,7 +1502,7 @@ class PythonRunnerApp(Gtk.Window):
                 self._set_status_message("Error applying settings.")
                 return False
 
-            changed = False
+            changed_keys = set()
             target_settings = target_paned.tab_settings
 
             new_cs_id = cs_combo.get_active_id()
@@ -1006,44 +1522,24 @@ class PythonRunnerApp(Gtk.Window):
                 if vp_entry.get_text():
                     vp_entry.set_text("")
 
-            if (
-                cs_combo.get_sensitive()
-                and new_cs_id
-                and target_settings.get(SETTING_COLOR_SCHEME_ID) != new_cs_id
-            ):
-                target_settings[SETTING_COLOR_SCHEME_ID] = new_cs_id
-                changed = True
-            if (
-                target_settings.get(SETTING_DRAW_WHITESPACES, DEFAULT_DRAW_WHITESPACES)
-                != new_draw_ws
-            ):
-                target_settings[SETTING_DRAW_WHITESPACES] = new_draw_ws
-                changed = True
-            if target_settings.get(SETTING_TAB_SIZE, DEFAULT_TAB_SIZE) != new_tab_size:
-                target_settings[SETTING_TAB_SIZE] = new_tab_size
-                changed = True
-            if (
-                target_settings.get(SETTING_TRANSLATE_TABS, DEFAULT_TRANSLATE_TABS)
-                != new_translate_tabs
-            ):
-                target_settings[SETTING_TRANSLATE_TABS] = new_translate_tabs
-                changed = True
-            if (
-                target_settings.get(SETTING_USE_CUSTOM_VENV, DEFAULT_USE_CUSTOM_VENV)
-                != new_use_custom
-            ):
-                target_settings[SETTING_USE_CUSTOM_VENV] = new_use_custom
-                changed = True
-            if (
-                target_settings.get(SETTING_VENV_FOLDER, DEFAULT_VENV_FOLDER)
-                != new_venv_path
-            ):
-                target_settings[SETTING_VENV_FOLDER] = new_venv_path
-                changed = True
-
-            if changed:
-                self.apply_tab_settings(apply_idx)
-                self.update_python_env_status()
+            new_values = {
+                SETTING_DRAW_WHITESPACES: new_draw_ws,
+                SETTING_TAB_SIZE: new_tab_size,
+                SETTING_TRANSLATE_TABS: new_translate_tabs,
+                SETTING_USE_CUSTOM_VENV: new_use_custom,
+                SETTING_VENV_FOLDER: new_venv_path,
+            }
+            if cs_combo.get_sensitive() and new_cs_id:
+                new_values[SETTING_COLOR_SCHEME_ID] = new_cs_id
+
+            for key, value in new_values.items():
+                if target_settings[key] != value:
+                    target_settings[key] = value
+                    changed_keys.add(key)
+
+            if changed_keys:
+                self._queue_apply_tab_settings(target_paned, changed_keys)
+                self._mark_cache_dirty()
                 saved = self._save_code_to_cache()
                 if saved:
                     self._set_status_message(f"Settings applied.")
@@ -1084,95 +1580,112 @@ class PythonRunnerApp(Gtk.Window):
             self._set_status_message("No active tab to show hotkeys in.")
             return
         output_buffer, output_view = (
-            tab_widgets["output_buffer"],
-            tab_widgets["output_view"],
+            tab_widgets.output_buffer,
+            tab_widgets.output_view,
         )
-        hotkey_list = """--- Hotkeys ---
-Ctrl+R         : Run Code
-Ctrl+C         : Copy Code/Selection
-Ctrl+S         : Export Code to File...
-Ctrl+T / Ctrl+,: Open Tab Settings
-Ctrl+H         : Show Hotkeys (this list)
-Ctrl+N         : New Tab
-Ctrl+W         : Remove Current Tab
-Ctrl+P         : Pip Freeze (list packages)
-"""
-        if output_buffer and output_view:
-            output_buffer.set_text(hotkey_list)
-            start = output_buffer.get_start_iter()
-            output_view.scroll_to_iter(start, 0.0, False, 0.0, 0.0)
-        else:
-            print("Warn: Cannot display hotkeys.", file=sys.stderr)
-            self._set_status_message(f"Error displaying hotkeys.")
-
-    def apply_tab_settings(self, page_index):
-        paned = self.notebook.get_nth_page(page_index)
-
-        if (
-            not paned
-            or not hasattr(paned, "tab_widgets")
-            or not hasattr(paned, "tab_settings")
-            or not isinstance(paned.tab_widgets, dict)
-            or not isinstance(paned.tab_settings, dict)
+        if output_buffer.get_char_count() != len(HOTKEY_TEXT) or (
+            output_buffer.get_text(
+                output_buffer.get_start_iter(), output_buffer.get_end_iter(), False
+            )
+            != HOTKEY_TEXT
         ):
+            output_buffer.set_text(HOTKEY_TEXT)
+        output_buffer.place_cursor(output_buffer.get_start_iter())
+        output_view.scroll_to_iter(output_buffer.get_start_iter(), 0.0, False, 0.0, 0.0)
+
+    def _queue_apply_tab_settings(self, paned, changed_keys):
+        self._pending_apply_keys.setdefault(paned, set()).update(changed_keys)
+        if self._apply_pending:
             return
+        self._apply_pending = True
+        GLib.idle_add(self._apply_pending_cb)
+
+    def _apply_pending_cb(self):
+        self._apply_pending = False
+        pending, self._pending_apply_keys = self._pending_apply_keys, {}
+
+        env_changed = False
+        for paned, keys in pending.items():
+            if paned.get_parent() is self.notebook and paned.tab_widgets:
+                self._apply_paned_settings(paned, keys)
+            if keys & ENV_SETTING_KEYS:
+                env_changed = True
+                cache_key = self._interpreter_cache_key(paned.tab_settings)
+                interpreter = self._interpreter_cache.pop(cache_key, None)
+                if interpreter:
+                    self._python_version_cache.pop(interpreter, None)
+                    self._python_version_failures.pop(interpreter, None)
+
+        if env_changed:
+            # A spare's sys.path and .pth state are fixed at its startup, so
+            # it goes stale once the environment is edited (e.g. pip install).
+            if self._spare_interpreter:
+                self._discard_interpreter_process(self._spare_interpreter)
+                self._spare_interpreter = None
+            self.update_python_env_status()
+        return GLib.SOURCE_REMOVE
 
+    def _apply_paned_settings(self, paned, changed_keys=None):
         widgets, settings = paned.tab_widgets, paned.tab_settings
-        inp, buf, draw = (
-            widgets.get("code_input"),
-            widgets.get("code_buffer"),
-            widgets.get("space_drawer"),
-        )
-        if not inp or not buf or not draw:
-            pass
-
-        if buf:
-            sm = GtkSource.StyleSchemeManager.get_default()
-            sid = settings.get(SETTING_COLOR_SCHEME_ID, DEFAULT_STYLE_SCHEME)
-            s = (
-                sm.get_scheme(sid)
-                or sm.get_scheme(DEFAULT_STYLE_SCHEME)
-                or sm.get_scheme("classic")
-            )
-            if s:
-                cur = buf.get_style_scheme()
-                if not cur or cur.get_id() != s.get_id():
-                    buf.set_style_scheme(s)
-
-        if inp and draw:
-            draw_ws = settings.get(SETTING_DRAW_WHITESPACES, DEFAULT_DRAW_WHITESPACES)
-            types = (
-                GtkSource.SpaceTypeFlags.SPACE | GtkSource.SpaceTypeFlags.TAB
-                if draw_ws
-                else GtkSource.SpaceTypeFlags.NONE
-            )
-            draw.set_types_for_locations(GtkSource.SpaceLocationFlags.ALL, types)
+        redraw = False
+        if changed_keys is None or SETTING_COLOR_SCHEME_ID in changed_keys:
+            redraw |= self._apply_color_scheme(widgets, settings)
+        if changed_keys is None or SETTING_DRAW_WHITESPACES in changed_keys:
+            redraw |= self._apply_whitespace(widgets, settings)
+        if changed_keys is None or changed_keys & TAB_WIDTH_SETTING_KEYS:
+            redraw |= self._apply_tabs(widgets, settings)
+
+        if redraw:
+            widgets.code_input.queue_draw()
+
+    def _apply_color_scheme(self, widgets, settings):
+        buf = widgets.code_buffer
+        s = self._get_style_scheme(settings[SETTING_COLOR_SCHEME_ID])
+        if not s:
+            return False
+        cur = buf.get_style_scheme()
+        if cur and cur.get_id() == s.get_id():
+            return False
+        buf.set_style_scheme(s)
+        return True
 
-        if inp:
-            size = settings.get(SETTING_TAB_SIZE, DEFAULT_TAB_SIZE)
-            trans = settings.get(SETTING_TRANSLATE_TABS, DEFAULT_TRANSLATE_TABS)
-            if inp.get_tab_width() != size:
-                inp.set_tab_width(size)
-            if inp.get_insert_spaces_instead_of_tabs() != trans:
-                inp.set_insert_spaces_instead_of_tabs(trans)
-            inp.queue_draw()
+    def _apply_whitespace(self, widgets, settings):
+        draw = widgets.space_drawer
+        draw_ws = settings[SETTING_DRAW_WHITESPACES]
+        types = (
+            GtkSource.SpaceTypeFlags.SPACE | GtkSource.SpaceTypeFlags.TAB
+            if draw_ws
+            else GtkSource.SpaceTypeFlags.NONE
+        )
+        if draw.get_types_for_locations(GtkSource.SpaceLocationFlags.ALL) == types:
+            return False
+        draw.set_types_for_locations(GtkSource.SpaceLocationFlags.ALL, types)
+        return True
+
+    def _apply_tabs(self, widgets, settings):
+        inp = widgets.code_input
+        changed = False
+        size = settings[SETTING_TAB_SIZE]
+        trans = settings[SETTING_TRANSLATE_TABS]
+        if inp.get_tab_width() != size:
+            inp.set_tab_width(size)
+            changed = True
+        if inp.get_insert_spaces_instead_of_tabs() != trans:
+            inp.set_insert_spaces_instead_of_tabs(trans)
+            changed = True
+        return changed
 
     def get_python_interpreter(self):
-        idx = self.notebook.get_current_page()
+        paned = self._current_paned
 
-        if idx == -1:
+        if paned is None:
             return "Warning: No active tab"
 
-        paned = self.notebook.get_nth_page(idx)
-        tab_id = getattr(paned, "tab_id", f"Index {idx}")
+        tab_id = getattr(paned, "tab_id", "Unknown")
+        settings = getattr(paned, "tab_settings", DEFAULT_TAB_SETTINGS)
 
-        if not paned or not hasattr(paned, "tab_settings"):
-            settings = DEFAULT_TAB_SETTINGS
-        else:
-            settings = paned.tab_settings
-
-        use_custom = settings.get(SETTING_USE_CUSTOM_VENV, DEFAULT_USE_CUSTOM_VENV)
-        venv_folder = settings.get(SETTING_VENV_FOLDER, DEFAULT_VENV_FOLDER)
+        use_custom = settings[SETTING_USE_CUSTOM_VENV]
+        venv_folder = settings[SETTING_VENV_FOLDER]
 
         # Set current working directory venv
         if venv_folder == DEFAULT_VENV_FOLDER:
@@ -1184,101 +1697,231 @@ Ctrl+P         : Pip Freeze (list packages)
         if use_custom and not venv_folder.strip():
             use_custom = False
 
-        if use_custom:
-            if venv_folder and os.path.isdir(venv_folder):
-                found = None
-                for bindir in ["bin", "Scripts"]:
-                    binpath = os.path.join(venv_folder, bindir)
-                    if os.path.isdir(binpath):
-                        for name in ["python3", "python", "python.exe"]:
-                            exe = os.path.join(binpath, name)
-                            if os.path.isfile(exe) and os.access(exe, os.X_OK):
-                                found = exe
-                                return found
-            elif venv_folder:
-                print(
-                    f"Warn: Custom venv path '{venv_folder}' for tab {tab_id} is not a valid directory. Falling back.",
-                    file=sys.stderr,
+        cache_key = self._interpreter_cache_key(settings)
+        cached = self._interpreter_cache.get(cache_key)
+        if cached:
+            return cached
+
+        interpreter = self._resolve_python_interpreter(use_custom, venv_folder, tab_id)
+        if not interpreter.startswith("Warning:"):
+            self._interpreter_cache[cache_key] = interpreter
+        return interpreter
+
+    def _interpreter_cache_key(self, settings):
+        venv_folder = settings[SETTING_VENV_FOLDER]
+        if settings[SETTING_USE_CUSTOM_VENV] and venv_folder.strip():
+            return (True, venv_folder)
+        return (False, DEFAULT_VENV_FOLDER)
+
+    def _resolve_python_interpreter(self, use_custom, venv_folder, tab_id):
+        if use_custom and venv_folder:
+            for bindir in ("bin", "Scripts"):
+                try:
+                    with os.scandir(os.path.join(venv_folder, bindir)) as it:
+                        names = {
+                            entry.name: entry.path
+                            for entry in it
+                            if entry.name in VENV_PYTHON_NAMES
+                            and entry.is_file()
+                            and os.access(entry.path, os.X_OK)
+                        }
+                except OSError:
+                    continue
+                for name in VENV_PYTHON_NAMES:
+                    if name in names:
+                        return names[name]
+            if not os.path.isdir(venv_folder):
+                self._warn_once(
+                    f"Warn: Custom venv path '{venv_folder}' for tab {tab_id} is not a valid directory. Falling back."
                 )
 
-        system_py = shutil.which("python3") or shutil.which("python")
-        if system_py:
-            return system_py
+        if self._system_python is None:
+            self._system_python = (
+                shutil.which("python3") or shutil.which("python") or sys.executable
+            )
+        if self._system_python:
+            return self._system_python
 
-        print(
-            f"Error: No 'python3' or 'python' found in PATH (needed for tab {tab_id}).",
-            file=sys.stderr,
+        self._warn_once(
+            f"Error: No 'python3' or 'python' found in PATH (needed for tab {tab_id})."
         )
         return "Warning: No Python found"
 
+    def _warn_once(self, message):
+        if message not in self._reported_warnings:
+            self._reported_warnings.add(message)
+            print(message, file=sys.stderr)
+
     def update_python_env_status(self, source_view=None):
-        py_interp = self.get_python_interpreter()
+        self._interp_path = None
+        if not self._status_refresh_id:
+            self._status_refresh_id = GLib.idle_add(self._refresh_python_env_status)
+
+    def _refresh_python_env_status(self):
+        self._status_refresh_id = None
+        py_interp = self._interp_path = self.get_python_interpreter()
 
         status_text = "Ready"
 
-        py_ver, status_suffix = "Unknown", py_interp
-        if py_interp.startswith("Warning:"):
-            status_suffix = f"Python Env: {py_interp}"
-        elif not os.path.exists(py_interp):
-            status_suffix = f"Python Env: Not Found ('{os.path.basename(py_interp)}')"
-        else:
-            try:
-                res = subprocess.run(
-                    [py_interp, "--version"],
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                    timeout=2,
-                    encoding="utf-8",
-                    errors="replace",
-                )
-                version_output = (res.stderr or res.stdout or "").strip()
-                if res.returncode == 0 and "Python" in version_output:
-                    parts = version_output.split()
-                    py_ver = parts[1] if len(parts) > 1 else version_output
+        if not py_interp.startswith("Warning:") and os.path.exists(py_interp):
+            py_ver = self._python_version_cache.get(py_interp)
+            if py_ver is None:
+                failure = self._python_version_failures.get(py_interp)
+                if failure and failure[0] > GLib.get_monotonic_time():
+                    py_ver = failure[1]
                 else:
-                    if res.returncode != 0 and not (
-                        "No such file" in (res.stderr or "")
-                        or "not found" in (res.stderr or "")
-                    ):
-                        pass
-                    py_ver = "Version N/A"
-            except FileNotFoundError:
-                py_ver = "Not Found"
-                py_interp = os.path.basename(py_interp)
-            except subprocess.TimeoutExpired:
-                py_ver = "Timeout"
-            except Exception as e:
-                print(
-                    f"Error checking Python version for '{py_interp}': {e}",
-                    file=sys.stderr,
-                )
-                py_ver = "Error"
+                    py_ver = "checking version..."
+                    self._probe_python_version(py_interp)
+            status_text = f"{py_interp} ({py_ver})"
 
-            status_suffix = f"{py_interp} ({py_ver})"
-            status_text = status_suffix
+        self._default_status_text = status_text
+        if not self._status_expiry:
+            self._set_status_label(status_text)
+        return GLib.SOURCE_REMOVE
 
-        if not self._status_timeout_id:
-            self.status_label.set_text(status_text)
+    def _probe_python_version(self, py_interp):
+        if py_interp in self._version_probes:
+            return
 
-    def on_tab_switched(self, notebook, page, page_num):
-        if self._status_timeout_id:
-            GLib.source_remove(self._status_timeout_id)
-            self._status_timeout_id = None
-            self._temporary_status_context = None
+        real_interp = os.path.realpath(py_interp)
+        py_ver = self._python_version_cache.get(real_interp)
+        if py_ver is None and real_interp == os.path.realpath(sys.executable):
+            py_ver = "%d.%d.%d" % sys.version_info[:3]
+        if py_ver is not None:
+            self._python_version_cache[py_interp] = py_ver
+            self._python_version_cache[real_interp] = py_ver
+            self._show_python_version(py_interp, py_ver)
+            return
+
+        py_ver = self._read_pyvenv_version(py_interp)
+        if py_ver is not None:
+            self._python_version_cache[py_interp] = py_ver
+            self._show_python_version(py_interp, py_ver)
+            return
+
+        try:
+            proc = Gio.Subprocess.new(
+                [py_interp, "-S", "-c", VERSION_PROBE_CODE],
+                Gio.SubprocessFlags.STDOUT_PIPE
+                | Gio.SubprocessFlags.STDERR_SILENCE
+                | Gio.SubprocessFlags.INHERIT_FDS,
+            )
+        except GLib.Error as e:
+            print(
+                f"Error checking Python version for '{py_interp}': {e.message}",
+                file=sys.stderr,
+            )
+            self._record_python_version_failure(py_interp, "Not Found")
+            return
+
+        probe = {
+            "proc": proc,
+            "real_interp": real_interp,
+            "timed_out": False,
+            "timeout_id": None,
+        }
+        probe["timeout_id"] = GLib.timeout_add(
+            VERSION_PROBE_TIMEOUT_MS, self._on_python_version_timeout, probe
+        )
+        self._version_probes[py_interp] = probe
+        proc.communicate_async(None, None, self._on_python_version_probed, py_interp)
+
+    def _read_pyvenv_version(self, py_interp):
+        cfg_path = os.path.join(
+            os.path.dirname(os.path.dirname(py_interp)), "pyvenv.cfg"
+        )
+        try:
+            with open(cfg_path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    key, sep, value = line.partition("=")
+                    if sep and key.strip() in ("version", "version_info"):
+                        return ".".join(value.strip().split(".")[:3]) or None
+        except OSError:
+            pass
+        return None
+
+    def _on_python_version_timeout(self, probe):
+        probe["timeout_id"] = None
+        probe["timed_out"] = True
+        probe["proc"].force_exit()
+        return GLib.SOURCE_REMOVE
+
+    def _on_python_version_probed(self, proc, result, py_interp):
+        probe = self._version_probes.pop(py_interp)
+        if probe["timeout_id"]:
+            GLib.source_remove(probe["timeout_id"])
+
+        try:
+            _, stdout, _ = proc.communicate_finish(result)
+        except GLib.Error as e:
+            print(
+                f"Error checking Python version for '{py_interp}': {e.message}",
+                file=sys.stderr,
+            )
+            self._record_python_version_failure(py_interp, "Error")
+            return
+
+        if probe["timed_out"]:
+            self._record_python_version_failure(py_interp, "Timeout")
+            return
+
+        version_output = stdout.get_data()[:64] if stdout else b""
+        if not proc.get_successful() or not version_output:
+            self._record_python_version_failure(py_interp, "Version N/A")
+            return
+
+        py_ver = version_output.decode("ascii", "replace")
+        self._python_version_cache[py_interp] = py_ver
+        self._python_version_cache[probe["real_interp"]] = py_ver
+        self._show_python_version(py_interp, py_ver)
+
+    def _record_python_version_failure(self, py_interp, py_ver):
+        self._python_version_failures[py_interp] = (
+            GLib.get_monotonic_time() + VERSION_FAILURE_TTL_S * 1000000,
+            py_ver,
+        )
+        self._show_python_version(py_interp, py_ver)
+
+    def _show_python_version(self, py_interp, py_ver):
+        if self._interp_path != py_interp:
+            return
+        self._default_status_text = f"{py_interp} ({py_ver})"
+        if not self._status_expiry:
+            self._set_status_label(self._default_status_text)
 
+    def on_tab_switched(self, notebook, page, page_num):
+        self._ensure_tab_content(page)
+        self._current_paned = page
+        self._status_expiry = 0
+        self._temporary_status_context = None
         self.update_python_env_status()
 
+    def on_page_added(self, notebook, child, page_num):
+        self._tab_paneds.insert(page_num, child)
+
+    def on_page_reordered(self, notebook, child, page_num):
+        self._tab_paneds.remove(child)
+        self._tab_paneds.insert(page_num, child)
+
     def on_page_removed(self, notebook, child, page_num):
+        self._tab_paneds.remove(child)
+        tab_widgets = getattr(child, "tab_widgets", None)
+        if tab_widgets:
+            self._code_text_cache.pop(tab_widgets.code_buffer, None)
+        if child is self._current_paned:
+            self._current_paned = None
+
         current_page = notebook.get_current_page()
         if current_page != -1:
             self.update_python_env_status()
         else:
-            if self._status_timeout_id:
-                GLib.source_remove(self._status_timeout_id)
-                self._status_timeout_id = None
-                self._temporary_status_context = None
-        self.status_label.set_text("No tabs open. Press Ctrl+N for a new tab.")
+            self._status_expiry = 0
+            self._temporary_status_context = None
+        self._set_status_label("No tabs open. Press Ctrl+N for a new tab.")
+
+    def _set_status_label(self, text):
+        if self.status_label.get_label() != text:
+            self.status_label.set_text(text)
 
     def _set_status_message(
         self,
@@ -1287,23 +1930,37 @@ Ctrl+P         : Pip Freeze (list packages)
         temporary_source_view=None,
         timeout=STATUS_MESSAGE_TIMEOUT_MS,
     ):
-        if self._status_timeout_id:
-            GLib.source_remove(self._status_timeout_id)
-            self._status_timeout_id = None
-
-        self.status_label.set_text(text)
+        self._set_status_label(text)
 
         if temporary:
             self._temporary_status_context = temporary_source_view
-            self._status_timeout_id = GLib.timeout_add(
-                timeout, self._restore_default_status
-            )
+            self._status_expiry = GLib.get_monotonic_time() + timeout * 1000
+            if not self._status_timeout_id:
+                self._status_timeout_id = GLib.timeout_add(
+                    timeout, self._on_status_timeout
+                )
         else:
+            self._status_expiry = 0
             self._temporary_status_context = None
 
-    def _restore_default_status(self, *user_data):
+    def _on_status_timeout(self):
         self._status_timeout_id = None
-        self.update_python_env_status()
+        if not self._status_expiry:
+            return GLib.SOURCE_REMOVE
+        remaining_ms = (self._status_expiry - GLib.get_monotonic_time()) // 1000
+        if remaining_ms > 0:
+            self._status_timeout_id = GLib.timeout_add(
+                remaining_ms, self._on_status_timeout
+            )
+            return GLib.SOURCE_REMOVE
+        return self._restore_default_status()
+
+    def _restore_default_status(self, *user_data):
+        self._status_expiry = 0
+        if self._default_status_text is not None:
+            self._set_status_label(self._default_status_text)
+        else:
+            self.update_python_env_status()
         self._temporary_status_context = None
         return GLib.SOURCE_REMOVE
 
@@ -1319,10 +1976,10 @@ Ctrl+P         : Pip Freeze (list packages)
 
             tab_id = getattr(page, "tab_id", f"Index {idx}")
             self.notebook.remove_page(idx)
-            self._save_code_to_cache()
+            self._mark_cache_dirty()
 
             new_widgets = self._get_current_tab_widgets()
-            new_input_view = new_widgets["code_input"] if new_widgets else None
+            new_input_view = new_widgets.code_input if new_widgets else None
             self._set_status_message(
                 f"Tab '{tab_id}' removed.", temporary_source_view=new_input_view
             )
@@ -1335,11 +1992,11 @@ Ctrl+P         : Pip Freeze (list packages)
             self._set_status_message("No active tab found.")
             return
         out_buf, out_view, inp = (
-            widgets["output_buffer"],
-            widgets["output_view"],
-            widgets["code_input"],
+            widgets.output_buffer,
+            widgets.output_view,
+            widgets.code_input,
         )
-        py_interp = self.get_python_interpreter()
+        py_interp = self._interp_path or self.get_python_interpreter()
         if py_interp.startswith("Warning:") or not os.path.exists(py_interp):
             msg = (
                 f"Error: Cannot run pip freeze, invalid/missing Python ('{py_interp}')."
@@ -1353,72 +2010,130 @@ Ctrl+P         : Pip Freeze (list packages)
             temporary_source_view=inp,
         )
         out_buf.set_text("Running pip freeze...\n")
-        threading.Thread(
-            target=self._run_pip_freeze_thread,
-            args=(py_interp, out_buf, out_view, inp),
-            daemon=True,
-        ).start()
+        self._worker_pool.submit(
+            self._run_pip_freeze_thread, py_interp, out_buf, out_view, inp
+        )
 
     def _run_pip_freeze_thread(
         self, python_interpreter, output_buffer, output_view, source_view
     ):
-        output, error, success = "", "", False
+        freeze = {
+            "chunks": [],
+            "lock": threading.Lock(),
+            "flush_pending": False,
+            "started": False,
+            "output_buffer": output_buffer,
+            "output_view": output_view,
+        }
+        error, success, timed_out = "", False, False
         process = None
+        stderr_parts = []
         try:
             cmd = [python_interpreter, "-m", "pip", "freeze"]
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
+                close_fds=False,
             )
-            stdout, stderr = process.communicate(timeout=EXECUTION_TIMEOUT)
-            if process.returncode == 0:
-                output = stdout or "# No packages installed."
+            self._pip_freeze_processes.add(process)
+            deadline = GLib.get_monotonic_time() + EXECUTION_TIMEOUT * 1000000
+            decoders = {}
+            with selectors.DefaultSelector() as selector:
+                for pipe in (process.stdout, process.stderr):
+                    selector.register(pipe, selectors.EVENT_READ)
+                    decoders[pipe] = codecs.getincrementaldecoder("utf-8")("replace")
+                while selector.get_map():
+                    remaining = deadline - GLib.get_monotonic_time()
+                    if remaining <= 0:
+                        timed_out = True
+                        process.kill()
+                        break
+                    for key, _ in selector.select(remaining / 1000000):
+                        data = os.read(key.fd, OUTPUT_READ_CHUNK_SIZE)
+                        if not data:
+                            selector.unregister(key.fileobj)
+                        text = decoders[key.fileobj].decode(data, final=not data)
+                        if not text:
+                            continue
+                        if key.fileobj is process.stderr:
+                            stderr_parts.append(text)
+                            continue
+                        with freeze["lock"]:
+                            freeze["chunks"].append(text)
+                            if not freeze["flush_pending"]:
+                                freeze["flush_pending"] = True
+                                GLib.idle_add(self._flush_pip_freeze_output, freeze)
+
+            if not timed_out:
+                try:
+                    process.wait(
+                        timeout=max(deadline - GLib.get_monotonic_time(), 0) / 1000000
+                    )
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+            stderr = "".join(stderr_parts)
+            if timed_out:
+                error = f"--- Error: pip freeze timed out ({EXECUTION_TIMEOUT}s) ---\n{stderr}"
+            elif process.returncode == 0:
                 success = True
                 if stderr:
                     error = f"--- Pip Warnings/Stderr ---\n{stderr}"
+            elif "No module named pip" in stderr:
+                error = f"Error: 'pip' module not found for '{os.path.basename(python_interpreter)}'."
             else:
-                if "No module named pip" in stderr:
-                    error = f"Error: 'pip' module not found for '{os.path.basename(python_interpreter)}'."
-                else:
-                    error = f"Error running pip freeze (RC: {process.returncode}):\n{stderr}"
-                output = stdout
+                error = (
+                    f"Error running pip freeze (RC: {process.returncode}):\n{stderr}"
+                )
         except FileNotFoundError:
             error = f"Error: Interpreter '{python_interpreter}' not found."
-        except subprocess.TimeoutExpired:
-            success = False
-            if process:
-                process.kill()
-                try:
-                    stdout, stderr = process.communicate(timeout=1)
-                except Exception:
-                    stdout, stderr = "", "(Timeout/Error fetching output after kill)"
-                output = stdout
-                error = f"--- Error: pip freeze timed out ({EXECUTION_TIMEOUT}s) ---\n{stderr}"
-            else:
-                error = f"Error: pip freeze timed out ({EXECUTION_TIMEOUT}s)."
         except Exception as e:
             error = f"Error executing pip freeze: {e}"
-            success = False
         finally:
-            if process and process.poll() is None:
-                try:
-                    process.kill()
-                    process.communicate(timeout=1)
-                except Exception:
-                    pass
-        GLib.idle_add(
-            self._update_output_view,
-            output,
-            error,
-            success,
-            output_buffer,
-            output_view,
-            source_view,
-        )
+            self._pip_freeze_processes.discard(process)
+            if process:
+                if process.poll() is None:
+                    try:
+                        process.kill()
+                        process.wait(timeout=1)
+                    except Exception:
+                        pass
+                process.stdout.close()
+                process.stderr.close()
+        GLib.idle_add(self._finish_pip_freeze, freeze, error, success, source_view)
+
+    def _flush_pip_freeze_output(self, freeze):
+        with freeze["lock"]:
+            text = "".join(freeze["chunks"])
+            freeze["chunks"].clear()
+            freeze["flush_pending"] = False
+        if text:
+            if not freeze["started"]:
+                freeze["started"] = True
+                self._clear_output(freeze["output_buffer"])
+            self._append_output(freeze["output_buffer"], freeze["output_view"], text)
+        return GLib.SOURCE_REMOVE
+
+    def _finish_pip_freeze(self, freeze, error, success, source_view):
+        self._flush_pip_freeze_output(freeze)
+        if not freeze["started"]:
+            self._update_output_view(
+                "# No packages installed." if success else "",
+                error,
+                success,
+                freeze["output_buffer"],
+                freeze["output_view"],
+                source_view,
+            )
+            return GLib.SOURCE_REMOVE
+
+        output_buffer = freeze["output_buffer"]
+        if error:
+            if output_buffer.get_char_count() > 0:
+                error = "\n" + error
+            self._append_output(output_buffer, freeze["output_view"], error)
+        self._restore_status_after_output(source_view)
+        return GLib.SOURCE_REMOVE
 
 
 def main():